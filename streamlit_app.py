@@ -6,8 +6,101 @@
 
 import streamlit as st
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pv
 import re
-from io import StringIO
+from io import BytesIO
+
+# ──────────────────────────────  Regex patterns  ──────────────────────────────
+_SPLIT_HASH = re.compile(r'(?<=[.!?])\s+|(?=#[^\s]+)')
+_SPLIT_NOHASH = re.compile(r'(?<=[.!?])\s+')
+_WS = re.compile(r'\s+')
+
+# Parallel decode unit for pyarrow's CSV reader
+_CSV_BLOCK_SIZE = 8 << 20
+
+# pandas.read_csv's default NA tokens, so string cells go null the same way they did before
+_NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+]
+
+# ──────────────────────────────  Data processing  ──────────────────────────────
+def _dedupe_columns(names: list[str]) -> list[str]:
+    """Rename blank and repeated headers the way ``pd.read_csv`` does (``Unnamed: 2``, ``a.1``)."""
+    unnamed = [i for i, name in enumerate(names) if not name]
+    names = [name or f"Unnamed: {i}" for i, name in enumerate(names)]
+    counts = {}
+    # Named columns keep their names; blank ones are mangled after them
+    for i in [i for i in range(len(names)) if i not in unnamed] + unnamed:
+        base = name = names[i]
+        count = counts.get(name, 0)
+        while count > 0:
+            counts[base] = count + 1
+            name = f"{base}.{count}"
+            count = count + 1 if name in names else counts.get(name, 0)
+        names[i] = name
+        counts[name] = count + 1
+    return names
+
+
+@st.cache_data(show_spinner=False)
+def _load_csv(csv_bytes: bytes, usecols: list[str] | None = None) -> pd.DataFrame:
+    """Parse the uploaded CSV once per file instead of on every rerun."""
+    table = pv.read_csv(
+        BytesIO(csv_bytes),
+        read_options=pv.ReadOptions(block_size=_CSV_BLOCK_SIZE),
+        # Captions often contain line breaks inside quoted fields
+        parse_options=pv.ParseOptions(newlines_in_values=True),
+        convert_options=pv.ConvertOptions(null_values=_NA_VALUES, strings_can_be_null=True),
+    )
+    # Select after renaming: include_columns cannot tell duplicate headers apart
+    table = table.rename_columns(_dedupe_columns(table.column_names))
+    # pyarrow loads text that is not valid UTF-8 as binary instead of failing
+    binary = [field.name for field in table.schema if pa.types.is_binary(field.type)]
+    if binary:
+        raise ValueError(f"Column(s) {', '.join(binary)} are not valid UTF-8 text. Re-save the file as UTF-8.")
+    if usecols:
+        table = table.select(usecols)
+    return table.to_pandas()
+
+
+def process_dataframe(raw_df: pd.DataFrame, include_hashtags: bool) -> pd.DataFrame:
+    """Split each ``Context`` (already coerced to ``str``) into one row per sentence."""
+    pattern = _SPLIT_HASH if include_hashtags else _SPLIT_NOHASH
+
+    sentences = (
+        raw_df[["ID", "Context"]]
+        # Collapsing whitespace once per caption leaves the split points unchanged,
+        # so each piece only needs a strip afterwards
+        .assign(Statement=raw_df["Context"].str.replace(_WS, ' ', regex=True).str.split(pattern, regex=True))
+        .explode("Statement")
+    )
+    # Number pieces per source row before filtering, like enumerate() over re.split did
+    sentences["Sentence ID"] = sentences.groupby(level=0).cumcount()
+    sentences["Statement"] = sentences["Statement"].str.strip()
+    # Empty after stripping .!? means the piece was blank or punctuation-only
+    keep = sentences["Statement"].str.strip(".!?").ne("")
+
+    # ID and Context repeat once per sentence of the same post
+    return sentences[keep].reset_index(drop=True).astype({"ID": "category", "Context": "category"})
+
+
+@st.cache_data(show_spinner=False)
+def _transform(csv_bytes: bytes, id_col: str, context_col: str, include_hashtags: bool) -> pd.DataFrame:
+    """Run the whole pipeline once per file and option set."""
+    usecols = list(dict.fromkeys([id_col, context_col]))
+    raw_df = _load_csv(csv_bytes, usecols).rename(columns={id_col: "ID", context_col: "Context"})
+    raw_df["Context"] = raw_df["Context"].fillna("").astype(str)
+    return process_dataframe(raw_df, include_hashtags)
+
+
+@st.cache_data(show_spinner=False)
+def _to_csv(csv_bytes: bytes, id_col: str, context_col: str, include_hashtags: bool) -> bytes:
+    """Encode the transformed data for download, keyed like ``_transform``."""
+    buff = BytesIO()
+    _transform(csv_bytes, id_col, context_col, include_hashtags).to_csv(buff, index=False, encoding='utf-8')
+    return buff.getvalue()
 
 # ──────────────────────────────  Page set‑up  ──────────────────────────────
 st.set_page_config(
@@ -65,53 +158,47 @@ st.header("Step 1: 📂 Upload Your Dataset")
 uploaded_file = st.file_uploader("Upload a CSV file with IG post data", type="csv")
 
 if uploaded_file:
-    raw_df = pd.read_csv(uploaded_file)
+    csv_bytes = uploaded_file.getvalue()
+    try:
+        raw_df = _load_csv(csv_bytes)
+    except ValueError as err:  # also covers pa.ArrowInvalid parse errors
+        st.error(f"Could not read the uploaded CSV: {err}")
+        st.stop()
     st.success(f"File uploaded successfully! Found {raw_df.shape[0]} rows and {raw_df.shape[1]} columns.")
 
     st.markdown("### 🔍 Data Preview")
-    st.dataframe(raw_df)
+    preview_rows = st.number_input("Rows to preview", min_value=10, max_value=1000, value=100, step=10)
+    st.dataframe(raw_df.head(preview_rows))
 
     st.markdown("### 📊 Column Information")
     column_info = pd.DataFrame({
-        "Column": raw_df.columns,
-        "Type": [raw_df[col].dtype for col in raw_df.columns],
-        "Non-null Count": [raw_df[col].count() for col in raw_df.columns],
-        "Sample Value": [raw_df[col].dropna().iloc[0] if not raw_df[col].dropna().empty else "" for col in raw_df.columns],
-    })
+        "Type": raw_df.dtypes,
+        "Non-null Count": raw_df.count(),
+        "Sample Value": raw_df.apply(lambda col: col.dropna().iloc[0] if col.notna().any() else ""),
+    }).rename_axis("Column").reset_index()
     st.dataframe(column_info)
 
-    id_col = st.selectbox("Select the ID column (e.g., shortcode)", raw_df.columns)
-    context_col = st.selectbox("Select the Context column (e.g., caption)", raw_df.columns)
-    include_hashtags = st.checkbox("Include hashtags as separate sentences", value=True)
-
-    raw_df = raw_df.rename(columns={id_col: "ID", context_col: "Context"})
-
-    data = []
-    for _, row in raw_df.iterrows():
-        pattern = r'(?<=[.!?])\s+'
-        if include_hashtags:
-            pattern += r'|(?=#[^\s]+)'
-        sentences = re.split(pattern, str(row["Context"]))
-        for i, sentence in enumerate(sentences):
-            cleaned = re.sub(r'\s+', ' ', sentence.strip())
-            if cleaned and not re.fullmatch(r'[.!?]+', cleaned):
-                data.append({
-                    "ID": row["ID"],
-                    "Context": row["Context"],
-                    "Statement": cleaned,
-                    "Sentence ID": i
-                })
-
-    final_df = pd.DataFrame(data)
-
-    st.header("📊 Preview & Download")
-    st.markdown("### Preview of Processed Data")
-    st.dataframe(final_df.head())
-
-    csv = final_df.to_csv(index=False).encode('utf-8')
-    st.download_button(
-        label="📥 Download Processed CSV",
-        data=csv,
-        file_name="ig_posts_transformed_output.csv",
-        mime='text/csv'
-    )
+    with st.form("process"):
+        id_col = st.selectbox("Select the ID column (e.g., shortcode)", raw_df.columns)
+        context_col = st.selectbox("Select the Context column (e.g., caption)", raw_df.columns)
+        include_hashtags = st.checkbox("Include hashtags as separate sentences", value=True)
+        submitted = st.form_submit_button("Process")
+
+    # Keep the last submitted options so unrelated reruns (e.g. preview rows) still show results
+    if submitted:
+        st.session_state["options"] = (id_col, context_col, include_hashtags)
+    options = st.session_state.get("options")
+
+    if options and set(options[:2]) <= set(raw_df.columns):
+        final_df = _transform(csv_bytes, *options)
+
+        st.header("📊 Preview & Download")
+        st.markdown("### Preview of Processed Data")
+        st.dataframe(final_df.head(preview_rows))
+
+        st.download_button(
+            label="📥 Download Processed CSV",
+            data=_to_csv(csv_bytes, *options),
+            file_name="ig_posts_transformed_output.csv",
+            mime='text/csv'
+        )
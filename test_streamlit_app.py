@@ -0,0 +1,99 @@
+import csv
+from io import StringIO
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+import streamlit_app as app
+
+
+def _csv_bytes(rows):
+    buff = StringIO()
+    writer = csv.writer(buff)
+    writer.writerow(["shortcode", "caption", "likes"])
+    writer.writerows(rows)
+    return buff.getvalue().encode("utf-8")
+
+
+def _upload(csv_bytes):
+    at = AppTest.from_file("streamlit_app.py").run()
+    at.file_uploader[0].set_value(("posts.csv", csv_bytes, "text/csv"))
+    return at.run()
+
+
+def test_load_csv_multiline_captions_across_blocks():
+    caption = "Hello world. Nice day!\nSee you\nGreat day! #fun #sun"
+    rows = [(f"c{i}", caption, i) for i in range(200_000)]
+    csv_bytes = _csv_bytes(rows)
+    assert len(csv_bytes) > app._CSV_BLOCK_SIZE
+
+    df = app._load_csv(csv_bytes)
+
+    assert df.shape == (len(rows), 3)
+    assert (df["caption"] == caption).all()
+
+
+def test_load_csv_matches_pandas_null_strings():
+    rows = [("a", "", 1), ("b", "NA", 2), ("c", "None", 3), ("d", "Hello there.", 4)]
+
+    df = app._load_csv(_csv_bytes(rows))
+
+    assert df["caption"].isna().tolist() == [True, True, True, False]
+    assert df["caption"].count() == 1
+
+
+def test_load_csv_renames_blank_and_duplicate_headers():
+    csv_bytes = b"shortcode,caption,,,caption,a,a.1,a\nx,Hi. There.,,,dup,1,2,3\n"
+
+    df = app._load_csv(csv_bytes)
+
+    expected = ["shortcode", "caption", "Unnamed: 2", "Unnamed: 3", "caption.1", "a", "a.1", "a.2"]
+    assert list(df.columns) == expected
+    assert list(app._load_csv(csv_bytes, ["caption.1", "Unnamed: 2"]).columns) == ["caption.1", "Unnamed: 2"]
+
+
+def test_app_reports_rows_with_missing_fields():
+    at = _upload(b"shortcode,caption,likes\na,Hi. There.,1\nb,Only two\n")
+
+    assert not at.exception
+    assert "Expected 3 columns, got 2" in at.error[0].value
+
+
+def test_app_rejects_non_utf8_text():
+    at = _upload(b"shortcode,caption\na,caf\xe9. Ok.\n")
+
+    assert not at.exception
+    assert "caption are not valid UTF-8" in at.error[0].value
+    assert not at.dataframe
+
+
+@pytest.mark.parametrize(
+    ("caption", "include_hashtags", "expected"),
+    [
+        # Punctuation-only pieces are dropped but keep their Sentence ID slot
+        ("Hi.  There!!   ...  Bye?", True, [("Hi.", 0), ("There!!", 1), ("Bye?", 3)]),
+        ("Hi.  There!!   ...  Bye?", False, [("Hi.", 0), ("There!!", 1), ("Bye?", 3)]),
+        # Whitespace runs, including NBSP, collapse to one space and still split sentences
+        (
+            "One\u00a0\u00a0two.\t\tThree\n  four.\u00a0Five",
+            False,
+            [("One two.", 0), ("Three four.", 1), ("Five", 2)],
+        ),
+        ("Love it! #fun #sun", True, [("Love it!", 0), ("#fun", 2), ("#sun", 3)]),
+        ("Love it! #fun #sun", False, [("Love it!", 0), ("#fun #sun", 1)]),
+        ("Great day #fun", True, [("Great day", 0), ("#fun", 1)]),
+        ("Great day #fun", False, [("Great day #fun", 0)]),
+        # Blank and NA captions produce no rows
+        ("", True, []),
+        ("NA", True, []),
+    ],
+)
+def test_transform_splits_sentences(caption, include_hashtags, expected):
+    csv_bytes = _csv_bytes([("p1", caption, 1)])
+
+    df = app._transform(csv_bytes, "shortcode", "caption", include_hashtags)
+
+    assert list(df.columns) == ["ID", "Context", "Statement", "Sentence ID"]
+    assert list(zip(df["Statement"], df["Sentence ID"])) == expected
+    assert (df["ID"] == "p1").all()
+    assert (df["Context"] == caption).all()